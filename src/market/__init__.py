@@ -1 +1 @@
-from .market_agent import get_asset_data, get_candidates
+from .market_agent import get_asset_data, get_candidates, get_candidates_async
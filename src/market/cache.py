@@ -0,0 +1,71 @@
+"""
+Small TTL file cache for market data source responses.
+
+Entries are stored as JSON files under CACHE_DIR/{source}/{md5}.json with
+the layout {"ts": ..., "ttl": ..., "data": ...}. Keys are (source, symbol)
+tuples; the source part doubles as the sub-directory so different endpoints
+of one provider can be cached with different TTLs.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional, Tuple
+from src.utils.config import CACHE_DIR
+from src.utils.helpers import json_bytes, json_loads
+from src.utils.logger import log
+
+# TTLs (seconds) aligned with how often each kind of data actually changes
+QUOTE_TTL = 60
+PROFILE_TTL = 30 * 24 * 3600
+ESG_TTL = 90 * 24 * 3600
+# Negative-cache TTL for symbols / keys without ESG data (4xx from the provider)
+ESG_MISSING_TTL = 7 * 24 * 3600
+
+_STATS = {"hit": 0, "miss": 0}
+_STATS_LOCK = threading.Lock()
+
+def _path(key: Tuple[str, str]) -> str:
+    source, symbol = key
+    digest = hashlib.md5(f"{source}:{symbol}".encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, source, f"{digest}.json")
+
+def _count(kind: str, key: Tuple[str, str]):
+    with _STATS_LOCK:
+        _STATS[kind] += 1
+        hits, misses = _STATS["hit"], _STATS["miss"]
+    log.debug(f"[CACHE] {kind} {key[0]}/{key[1]} (hits={hits}, misses={misses})")
+
+def get(key: Tuple[str, str]) -> Optional[Any]:
+    """Return cached data for key, or None if missing or expired."""
+    try:
+        with open(_path(key), "rb") as f:
+            entry = json_loads(f.read())
+        if time.time() - entry["ts"] < entry["ttl"]:
+            _count("hit", key)
+            return entry["data"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log.debug(f"[CACHE] Ignoring unreadable entry for {key}: {e}")
+    _count("miss", key)
+    return None
+
+def put(key: Tuple[str, str], value: Any, ttl: int):
+    """Store value under key for ttl seconds. Failures are logged, never raised."""
+    path = _path(key)
+    entry = {"ts": time.time(), "ttl": ttl, "data": value}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write-then-rename so concurrent readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json_bytes(entry))
+        os.replace(tmp, path)
+    except Exception as e:
+        log.error(f"Failed to write cache entry for {key}: {e}")
+
+def stats() -> dict:
+    with _STATS_LOCK:
+        return dict(_STATS)
@@ -1,14 +1,22 @@
 from pycoingecko import CoinGeckoAPI
+from src.market import cache
 from src.utils.logger import log
+from src.utils.http import make_session
 import time
 
 cg = CoinGeckoAPI()
+# pooled session with retry/backoff on 429/5xx (honours Retry-After)
+cg.session = make_session(pool_size=8)
 
 def fetch(symbol_or_id: str) -> dict:
     """
     Fetch crypto asset by CoinGecko id (not ticker symbol).
     Example id: 'bitcoin', 'ethereum'
     """
+    key = ("coingecko", symbol_or_id)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
     try:
         data = cg.get_price(ids=symbol_or_id, vs_currencies='usd', include_market_cap='true', include_24hr_vol='true', include_24hr_change='true')
         if not data or symbol_or_id not in data:
@@ -22,6 +30,7 @@ def fetch(symbol_or_id: str) -> dict:
             "timestamp": int(time.time()),
             "source": "coingecko"
         }
+        cache.put(key, asset, cache.QUOTE_TTL)
         return asset
     except Exception as e:
         log.error(f"CoinGecko fetch error for {symbol_or_id}: {e}")
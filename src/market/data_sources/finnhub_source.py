@@ -1,54 +1,168 @@
+import asyncio
 import time
+import httpx
 import requests
+from src.market import cache
 from src.utils.config import FINNHUB_API_KEY
 from src.utils.logger import log
-from src.utils.helpers import safe_get
+from src.utils.helpers import safe_get, json_loads
+from src.utils.http import make_session, backoff_delay, RETRY_STATUSES, MAX_RETRIES
 
 BASE_URL = "https://finnhub.io/api/v1"
+TIMEOUT_SECS = 10
+ASYNC_LIMITS = httpx.Limits(max_connections=32)
 
-def _get(endpoint: str, params: dict):
-    params = params or {}
-    params.update({"token": FINNHUB_API_KEY})
-    resp = requests.get(f"{BASE_URL}/{endpoint}", params=params, timeout=10)
+# Request URLs are formatted once; only {symbol} is filled in per call
+_QUOTE_URL = f"{BASE_URL}/quote?token={FINNHUB_API_KEY}&symbol={{symbol}}"
+_PROFILE_URL = f"{BASE_URL}/stock/profile2?token={FINNHUB_API_KEY}&symbol={{symbol}}"
+_ESG_URL = f"{BASE_URL}/stock/esg?token={FINNHUB_API_KEY}&symbol={{symbol}}"
+
+# cache name -> (url template, ttl) — each endpoint is cached on its own cadence
+ENDPOINTS = {
+    "quote": (_QUOTE_URL, cache.QUOTE_TTL),
+    "profile": (_PROFILE_URL, cache.PROFILE_TTL),
+    "esg": (_ESG_URL, cache.ESG_TTL),
+}
+
+# Shared pooled session for the blocking path so repeated calls (and the
+# MarketAgent worker threads) reuse keep-alive connections to finnhub.io;
+# transient 429/5xx responses are retried with backoff
+_SESSION = make_session(pool_size=32)
+
+def _get(url: str):
+    resp = _SESSION.get(url, timeout=TIMEOUT_SECS)
     resp.raise_for_status()
-    return resp.json()
+    return json_loads(resp.content)
+
+def _cached_get(name: str, symbol: str):
+    key = (f"finnhub_{name}", symbol)
+    data = cache.get(key)
+    if data is not None:
+        return data
+    url, ttl = ENDPOINTS[name]
+    data = _get(url.format(symbol=symbol))
+    cache.put(key, data, ttl)
+    return data
+
+def new_client() -> httpx.AsyncClient:
+    """HTTP/2 AsyncClient; share one across many fetches so every symbol's
+    requests multiplex over a couple of connections."""
+    return httpx.AsyncClient(http2=True, timeout=TIMEOUT_SECS, limits=ASYNC_LIMITS)
+
+async def _aget(client: httpx.AsyncClient, url: str):
+    # Same limits as the blocking session (MAX_RETRIES, RETRY_STATUSES, capped
+    # Retry-After), done by hand because httpx has no status-based retries
+    for attempt in range(MAX_RETRIES + 1):
+        last_try = attempt == MAX_RETRIES
+        try:
+            resp = await client.get(url)
+            if resp.status_code not in RETRY_STATUSES or last_try:
+                resp.raise_for_status()
+                return json_loads(resp.content)
+            delay = backoff_delay(attempt, resp.headers.get("Retry-After"))
+        except httpx.TransportError:
+            if last_try:
+                raise
+            delay = backoff_delay(attempt)
+        await asyncio.sleep(delay)
+
+async def _cached_aget(client: httpx.AsyncClient, name: str, symbol: str):
+    key = (f"finnhub_{name}", symbol)
+    data = cache.get(key)
+    if data is not None:
+        return data
+    url, ttl = ENDPOINTS[name]
+    data = await _aget(client, url.format(symbol=symbol))
+    cache.put(key, data, ttl)
+    return data
+
+def _esg_unavailable(symbol: str, status) -> dict:
+    """
+    ESG fallback shared by the blocking and async paths. A 4xx (no ESG data
+    for the symbol, or no ESG access for the key) is cached as {} so the
+    endpoint isn't hit on every fetch; 429 / 5xx are transient and not cached.
+    """
+    if status is not None and 400 <= status < 500 and status != 429:
+        cache.put(("finnhub_esg", symbol), {}, cache.ESG_MISSING_TTL)
+    return {}
+
+def _build_asset(symbol: str, quote: dict, profile: dict, esg: dict) -> dict:
+    return {
+        "symbol": symbol,
+        "price": safe_get(quote, "c"),
+        "open": safe_get(quote, "o"),
+        "high": safe_get(quote, "h"),
+        "low": safe_get(quote, "l"),
+        "prev_close": safe_get(quote, "pc"),
+        "change": safe_get(quote, "d"),
+        "percent_change": safe_get(quote, "dp"),
+        "timestamp": int(time.time()),
+        "sector": safe_get(profile, "finnhubIndustry"),
+        "market_cap": safe_get(profile, "marketCapitalization"),
+        "name": safe_get(profile, "name"),
+        "exchange": safe_get(profile, "exchange"),
+        "currency": safe_get(profile, "currency"),
+        # ESG fields — may be None
+        "carbon_emissions": safe_get(esg, "carbonEmissions"),
+        "total_emissions": safe_get(esg, "totalEmissions"),
+        "governance_score": safe_get(esg, "governanceScore"),
+        "sustainability_report": safe_get(esg, "sustainabilityReport"),
+        "source": "finnhub"
+    }
+
+async def fetch_async(symbol: str, client: httpx.AsyncClient = None) -> dict:
+    """
+    Fetch live quote + profile + esg data for a symbol from Finnhub.
+    The three endpoints are requested concurrently and cached separately
+    (see ENDPOINTS). Pass a shared client (new_client) when fetching many
+    symbols so connections are reused.
+    """
+    if not FINNHUB_API_KEY:
+        log.error("FINNHUB_API_KEY is not set in environment")
+        return None
+    if client is None:
+        async with new_client() as own_client:
+            return await fetch_async(symbol, own_client)
+    quote, profile, esg = await asyncio.gather(
+        _cached_aget(client, "quote", symbol),
+        _cached_aget(client, "profile", symbol),
+        _cached_aget(client, "esg", symbol),
+        return_exceptions=True,
+    )
+    for exc in (quote, profile):
+        if isinstance(exc, httpx.HTTPStatusError):
+            log.error(f"Finnhub HTTP error for {symbol}: {exc}")
+            return None
+        if isinstance(exc, BaseException):
+            log.error(f"Unexpected error fetching {symbol} from Finnhub: {exc}")
+            return None
+    # esg may not exist for some symbols — handle gracefully
+    if isinstance(esg, httpx.HTTPStatusError):
+        esg = _esg_unavailable(symbol, esg.response.status_code)
+    elif isinstance(esg, BaseException):
+        log.error(f"Unexpected error fetching {symbol} from Finnhub: {esg}")
+        return None
+    return _build_asset(symbol, quote, profile, esg)
 
 def fetch(symbol: str) -> dict:
-    """Fetch live quote + profile + esg data for a symbol from Finnhub."""
+    """
+    Blocking fetch of quote + profile + esg data for a symbol from Finnhub.
+    Uses the pooled module session; use fetch_async to overlap the endpoints.
+    """
     if not FINNHUB_API_KEY:
         log.error("FINNHUB_API_KEY is not set in environment")
         return None
     try:
-        quote = _get("quote", {"symbol": symbol})
-        profile = _get("stock/profile2", {"symbol": symbol})
+        quote = _cached_get("quote", symbol)
+        profile = _cached_get("profile", symbol)
         # esg may not exist for some symbols — handle gracefully
         try:
-            esg = _get("stock/esg", {"symbol": symbol})
-        except requests.HTTPError:
+            esg = _cached_get("esg", symbol)
+        except requests.HTTPError as e:
+            esg = _esg_unavailable(symbol, e.response.status_code if e.response is not None else None)
+        except requests.exceptions.RetryError:
             esg = {}
-        asset = {
-            "symbol": symbol,
-            "price": safe_get(quote, "c"),
-            "open": safe_get(quote, "o"),
-            "high": safe_get(quote, "h"),
-            "low": safe_get(quote, "l"),
-            "prev_close": safe_get(quote, "pc"),
-            "change": safe_get(quote, "d"),
-            "percent_change": safe_get(quote, "dp"),
-            "timestamp": int(time.time()),
-            "sector": safe_get(profile, "finnhubIndustry"),
-            "market_cap": safe_get(profile, "marketCapitalization"),
-            "name": safe_get(profile, "name"),
-            "exchange": safe_get(profile, "exchange"),
-            "currency": safe_get(profile, "currency"),
-            # ESG fields — may be None
-            "carbon_emissions": safe_get(esg, "carbonEmissions"),
-            "total_emissions": safe_get(esg, "totalEmissions"),
-            "governance_score": safe_get(esg, "governanceScore"),
-            "sustainability_report": safe_get(esg, "sustainabilityReport"),
-            "source": "finnhub"
-        }
-        return asset
+        return _build_asset(symbol, quote, profile, esg)
     except requests.HTTPError as e:
         log.error(f"Finnhub HTTP error for {symbol}: {e}")
     except Exception as exc:
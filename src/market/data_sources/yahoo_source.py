@@ -5,30 +5,100 @@ This file provides the same fetch(symbol) interface as finnhub_source.fetch,
 so MarketAgent can easily switch or aggregate data later.
 
 For MVP we keep this as a placeholder that uses yfinance as needed.
+Prices for many symbols are pulled in one yf.download call (fetch_many);
+the slow-changing Ticker.info profile is cached separately and missing
+profiles are fetched concurrently.
 """
+from concurrent.futures import ThreadPoolExecutor
 import yfinance as yf
+from src.market import cache
+from src.utils.config import MAX_FETCH_WORKERS
 from src.utils.logger import log
 from src.utils.helpers import safe_get
+from typing import Dict, List
 import time
 
-def fetch(symbol: str) -> dict:
+# Subset of Ticker.info we actually use; the full payload is large
+PROFILE_FIELDS = ("sector", "marketCap", "shortName", "previousClose")
+
+def _profile(symbol: str) -> dict:
+    key = ("yahoo_profile", symbol)
+    profile = cache.get(key)
+    if profile is None:
+        info = yf.Ticker(symbol).info
+        profile = {field: safe_get(info, field) for field in PROFILE_FIELDS}
+        cache.put(key, profile, cache.PROFILE_TTL)
+    return profile
+
+def _profiles(symbols: List[str]) -> Dict[str, object]:
+    """Profiles for symbols fetched in parallel; a failed lookup maps to its exception."""
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(symbols))) as ex:
+        futures = {sym: ex.submit(_profile, sym) for sym in symbols}
+    profiles = {}
+    for sym, fut in futures.items():
+        try:
+            profiles[sym] = fut.result()
+        except Exception as e:
+            profiles[sym] = e
+    return profiles
+
+def _latest_close(rows):
+    if rows is None or rows.empty:
+        return None
+    closes = rows["Close"].dropna()
+    return float(closes.iloc[-1]) if not closes.empty else None
+
+def fetch_many(symbols: List[str]) -> Dict[str, dict]:
+    """Fetch several symbols with a single batched download. Returns a dict
+    keyed by symbol; symbols that could not be fetched are omitted."""
+    results = {}
+    pending = []
+    for sym in dict.fromkeys(symbols):
+        cached = cache.get(("yahoo", sym))
+        if cached is not None:
+            results[sym] = cached
+        else:
+            pending.append(sym)
+    if not pending:
+        return results
+
     try:
-        t = yf.Ticker(symbol)
-        info = t.info
-        quote = t.history(period="1d")
-        latest = None
-        if not quote.empty:
-            latest = quote.iloc[-1]
-        asset = {
-            "symbol": symbol,
-            "price": float(latest["Close"]) if latest is not None else safe_get(info, "previousClose"),
-            "timestamp": int(time.time()),
-            "sector": safe_get(info, "sector"),
-            "market_cap": safe_get(info, "marketCap"),
-            "name": safe_get(info, "shortName"),
-            "source": "yahoo"
-        }
-        return asset
+        frame = yf.download(pending, period="1d", group_by="ticker", threads=True, progress=False)
     except Exception as e:
-        log.error(f"Yahoo fetch error for {symbol}: {e}")
-        return None
+        log.error(f"Yahoo batch download error for {pending}: {e}")
+        frame = None
+    # group_by="ticker" yields (ticker, field) columns; older yfinance returns
+    # flat columns when only one ticker is requested
+    multi = frame is not None and frame.columns.nlevels > 1
+    tickers = set(frame.columns.get_level_values(0)) if multi else set()
+    profiles = _profiles(pending)
+
+    for sym in pending:
+        try:
+            rows = None
+            if frame is not None:
+                if multi:
+                    rows = frame[sym] if sym in tickers else None
+                else:
+                    rows = frame
+            profile = profiles[sym]
+            if isinstance(profile, Exception):
+                raise profile
+            price = _latest_close(rows)
+            asset = {
+                "symbol": sym,
+                "price": price if price is not None else profile.get("previousClose"),
+                "timestamp": int(time.time()),
+                "sector": profile.get("sector"),
+                "market_cap": profile.get("marketCap"),
+                "name": profile.get("shortName"),
+                "source": "yahoo"
+            }
+            cache.put(("yahoo", sym), asset, cache.QUOTE_TTL)
+            results[sym] = asset
+        except Exception as e:
+            log.error(f"Yahoo fetch error for {sym}: {e}")
+    return results
+
+def fetch(symbol: str) -> dict:
+    return fetch_many([symbol]).get(symbol)
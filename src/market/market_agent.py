@@ -2,13 +2,53 @@
 MarketAgent abstraction that fetches asset data from configured sources.
 This is not a full uAgent; rather a data provider the EAIN agent will call.
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cachetools import TTLCache
 from src.market.data_sources import finnhub_source, yahoo_source, coingecko_source
+from src.utils.config import MAX_FETCH_WORKERS
 from src.utils.logger import log
-from typing import List
+from typing import Dict, List, Tuple
 
 DEFAULT_SYMBOLS = ["AAPL", "MSFT", "NVDA", "GOOGL", "TSLA"]
 
+# MAX_FETCH_WORKERS bounds concurrent fetches; network-bound so threads are
+# fine, but keep it modest to stay under provider rate limits.
+
+# In-process cache of assembled assets keyed by (source, symbol); sits in
+# front of the per-source file cache so hot symbols skip disk as well.
+# Assets go in and come out as shallow copies, so callers may mutate what
+# they get back without affecting the cache.
+_CACHE = TTLCache(maxsize=1024, ttl=60)
+_LOCK = threading.Lock()
+
+def clear_cache():
+    with _LOCK:
+        _CACHE.clear()
+
+def _remember(source: str, symbol: str, data: dict):
+    if data:
+        with _LOCK:
+            _CACHE[(source, symbol)] = dict(data)
+
+def _split_cached(symbols: List[str], source: str) -> Tuple[Dict[str, dict], List[str]]:
+    """Return (cached assets by symbol, symbols still to fetch)."""
+    with _LOCK:
+        hits = {sym: _CACHE.get((source, sym)) for sym in symbols}
+    found = {sym: dict(data) for sym, data in hits.items() if data is not None}
+    return found, [sym for sym in dict.fromkeys(symbols) if sym not in found]
+
 def get_asset_data(symbol: str, source: str = "finnhub") -> dict:
+    with _LOCK:
+        data = _CACHE.get((source, symbol))
+    if data is not None:
+        return dict(data)
+    data = _fetch_asset_data(symbol, source)
+    _remember(source, symbol, data)
+    return data
+
+def _fetch_asset_data(symbol: str, source: str) -> dict:
     if source == "finnhub":
         return finnhub_source.fetch(symbol)
     if source == "yahoo":
@@ -19,13 +59,54 @@ def get_asset_data(symbol: str, source: str = "finnhub") -> dict:
     return None
 
 def get_candidates(symbols: List[str] = None, source: str = "finnhub") -> List[dict]:
+    """Fetch all symbols concurrently; results keep the input order and
+    symbols that fail or return no data are dropped."""
+    symbols = symbols or DEFAULT_SYMBOLS
+    if source == "yahoo":
+        # yfinance batches and threads the download itself
+        batch, missing = _split_cached(symbols, source)
+        if missing:
+            for sym, data in yahoo_source.fetch_many(missing).items():
+                _remember(source, sym, data)
+                batch[sym] = data
+        return [batch[sym] for sym in symbols if batch.get(sym)]
+    results = [None] * len(symbols)
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(symbols))) as ex:
+        futures = {ex.submit(get_asset_data, sym, source): i for i, sym in enumerate(symbols)}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as e:
+                log.error(f"Error getting asset data for {symbols[i]}: {e}")
+    return [r for r in results if r]
+
+async def get_candidates_async(symbols: List[str] = None, source: str = "finnhub") -> List[dict]:
+    """Async counterpart of get_candidates. Finnhub symbols share a single
+    HTTP/2 client, Yahoo uses one batched download and other sources run
+    their blocking fetch in worker threads."""
     symbols = symbols or DEFAULT_SYMBOLS
-    results = []
-    for sym in symbols:
-        try:
-            data = get_asset_data(sym, source=source)
-            if data:
-                results.append(data)
-        except Exception as e:
-            log.error(f"Error getting asset data for {sym}: {e}")
-    return results
+    batch, missing = _split_cached(symbols, source)
+    if not missing:
+        fetched = []
+    elif source == "finnhub":
+        async with finnhub_source.new_client() as client:
+            fetched = await asyncio.gather(
+                *(finnhub_source.fetch_async(sym, client) for sym in missing),
+                return_exceptions=True,
+            )
+    elif source == "yahoo":
+        yahoo_batch = await asyncio.to_thread(yahoo_source.fetch_many, missing)
+        fetched = [yahoo_batch.get(sym) for sym in missing]
+    else:
+        fetched = await asyncio.gather(
+            *(asyncio.to_thread(_fetch_asset_data, sym, source) for sym in missing),
+            return_exceptions=True,
+        )
+    for sym, data in zip(missing, fetched):
+        if isinstance(data, BaseException):
+            log.error(f"Error getting asset data for {sym}: {data}")
+            continue
+        _remember(source, sym, data)
+        batch[sym] = data
+    return [batch[sym] for sym in symbols if batch.get(sym)]
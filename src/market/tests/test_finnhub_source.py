@@ -0,0 +1,69 @@
+import asyncio
+import httpx
+import pytest
+from urllib3.response import HTTPResponse
+from src.market import cache
+from src.market.data_sources import finnhub_source
+from src.utils import http
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(finnhub_source, "FINNHUB_API_KEY", "test-key")
+
+def _run(handler, symbol="AAPL"):
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await finnhub_source.fetch_async(symbol, client)
+    return asyncio.run(main())
+
+def test_missing_esg_is_negatively_cached():
+    requested = []
+    def handler(request):
+        requested.append(request.url.path)
+        if request.url.path.endswith("/stock/esg"):
+            return httpx.Response(403)
+        if request.url.path.endswith("/quote"):
+            return httpx.Response(200, json={"c": 1.5, "dp": 0.4})
+        return httpx.Response(200, json={"finnhubIndustry": "Technology"})
+
+    first = _run(handler)
+    second = _run(handler)
+    assert first["sector"] == second["sector"] == "Technology"
+    assert second["carbon_emissions"] is None
+    assert requested.count("/api/v1/stock/esg") == 1
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    async def fake_sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(finnhub_source.asyncio, "sleep", fake_sleep)
+    return delays
+
+def _aget(handler, url="https://finnhub.io/api/v1/quote?symbol=AAPL"):
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await finnhub_source._aget(client, url)
+    return asyncio.run(main())
+
+def test_aget_retries_after_rate_limit(sleeps):
+    responses = [httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200, json={"c": 1.0})]
+    assert _aget(lambda request: responses.pop(0)) == {"c": 1.0}
+    assert sleeps == [2.0]
+
+def test_aget_gives_up_after_max_retries(sleeps):
+    calls = []
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    with pytest.raises(httpx.ConnectError):
+        _aget(handler)
+    assert len(calls) == http.MAX_RETRIES + 1
+    assert len(sleeps) == http.MAX_RETRIES
+
+def test_retry_after_is_capped_in_both_paths():
+    response = HTTPResponse(status=429, headers={"Retry-After": "3600"})
+    assert http.make_retry().get_retry_after(response) == http.MAX_BACKOFF_SECS
+    assert http.backoff_delay(0, "3600") == http.MAX_BACKOFF_SECS
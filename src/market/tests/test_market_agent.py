@@ -1,4 +1,5 @@
 import pytest
+from src.market import market_agent
 from src.market.market_agent import get_candidates
 
 def test_get_candidates():
@@ -6,3 +7,34 @@ def test_get_candidates():
     candidates = get_candidates(["AAPL", "MSFT"])
     assert isinstance(candidates, list)
     assert all("symbol" in c for c in candidates)
+
+def test_get_candidates_keeps_order_and_skips_failures(monkeypatch):
+    def fake_get_asset_data(symbol, source="finnhub"):
+        if symbol == "BAD":
+            raise RuntimeError("boom")
+        if symbol == "NONE":
+            return None
+        return {"symbol": symbol, "source": source}
+
+    monkeypatch.setattr(market_agent, "get_asset_data", fake_get_asset_data)
+    candidates = get_candidates(["AAPL", "BAD", "MSFT", "NONE", "NVDA"])
+    assert [c["symbol"] for c in candidates] == ["AAPL", "MSFT", "NVDA"]
+
+def test_get_asset_data_serves_repeat_calls_from_memory(monkeypatch):
+    calls = []
+    def fake_fetch(symbol, source):
+        calls.append((source, symbol))
+        return {"symbol": symbol, "source": source}
+
+    market_agent.clear_cache()
+    monkeypatch.setattr(market_agent, "_fetch_asset_data", fake_fetch)
+    first = market_agent.get_asset_data("AAPL", source="finnhub")
+    first["price"] = -1  # caller mutations must not leak into the cache
+    second = market_agent.get_asset_data("AAPL", source="finnhub")
+    second["sector"] = "Mutated"
+    third = market_agent.get_asset_data("AAPL", source="finnhub")
+    market_agent.get_asset_data("AAPL", source="yahoo")
+    assert third == {"symbol": "AAPL", "source": "finnhub"}
+    assert third is not second
+    assert calls == [("finnhub", "AAPL"), ("yahoo", "AAPL")]
+    market_agent.clear_cache()
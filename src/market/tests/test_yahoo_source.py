@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+from src.market import cache
+from src.market.data_sources import yahoo_source
+
+INFO = {
+    "AAPL": {"sector": "Technology", "marketCap": 3, "shortName": "Apple", "previousClose": 190.0},
+    "MSFT": {"sector": "Technology", "marketCap": 2, "shortName": "Microsoft", "previousClose": 410.0},
+}
+
+class FakeTicker:
+    requested = []
+
+    def __init__(self, symbol):
+        self.requested.append(symbol)
+        self.info = INFO[symbol]
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    FakeTicker.requested = []
+    monkeypatch.setattr(yahoo_source.yf, "Ticker", FakeTicker)
+
+def _download(monkeypatch, frame):
+    calls = []
+    def fake_download(symbols, **kwargs):
+        calls.append(list(symbols))
+        if isinstance(frame, Exception):
+            raise frame
+        return frame
+    monkeypatch.setattr(yahoo_source.yf, "download", fake_download)
+    return calls
+
+def test_multiindex_frame(monkeypatch):
+    columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], ["Open", "Close"]])
+    calls = _download(monkeypatch, pd.DataFrame([[1.0, 191.0, 2.0, 412.0]], columns=columns))
+    out = yahoo_source.fetch_many(["AAPL", "MSFT"])
+    assert calls == [["AAPL", "MSFT"]]
+    assert out["AAPL"]["price"] == 191.0
+    assert out["MSFT"]["price"] == 412.0
+    assert out["MSFT"]["name"] == "Microsoft"
+    assert sorted(FakeTicker.requested) == ["AAPL", "MSFT"]
+
+def test_flat_single_ticker_frame(monkeypatch):
+    _download(monkeypatch, pd.DataFrame({"Open": [1.0], "Close": [192.5]}))
+    out = yahoo_source.fetch_many(["AAPL"])
+    assert out["AAPL"]["price"] == 192.5
+    assert out["AAPL"]["sector"] == "Technology"
+
+def test_ticker_missing_from_frame_uses_previous_close(monkeypatch):
+    columns = pd.MultiIndex.from_product([["AAPL"], ["Open", "Close"]])
+    _download(monkeypatch, pd.DataFrame([[1.0, 191.0]], columns=columns))
+    out = yahoo_source.fetch_many(["AAPL", "MSFT"])
+    assert out["AAPL"]["price"] == 191.0
+    assert out["MSFT"]["price"] == 410.0
+
+def test_failed_download_uses_previous_close(monkeypatch):
+    _download(monkeypatch, RuntimeError("boom"))
+    out = yahoo_source.fetch_many(["AAPL", "MSFT"])
+    assert out["AAPL"]["price"] == 190.0
+    assert out["MSFT"]["price"] == 410.0
+
+def test_failed_profile_skips_only_that_symbol(monkeypatch):
+    _download(monkeypatch, RuntimeError("boom"))
+    out = yahoo_source.fetch_many(["AAPL", "NOPE"])
+    assert list(out) == ["AAPL"]
@@ -10,25 +10,49 @@ Simple client wrapper that exposes the high-level API the agent will use:
 Currently implemented using metta_shim internally. Swap to HTTP client
 for real MeTTa runtime easily.
 """
-from typing import List, Dict
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional
 from src.utils.logger import log
 from src.metta import metta_shim
 from src.utils.helpers import timestamp_secs
-import uuid
+import itertools
+import secrets
+import threading
 
-# In-memory atomstore for session / demo (simple dict)
-ATOM_STORE: Dict[str, Dict] = {}
+@dataclass(slots=True)
+class Atom:
+    id: str
+    ts: int
+    kind: str  # "Investor" | "Asset" | "Decision"
+    payload: Dict
 
-def _store_atom(atom: Dict) -> str:
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+# In-memory atomstore for session / demo: atoms in insertion order plus an
+# id -> position index
+_ATOMS: List[Atom] = []
+_INDEX: Dict[str, int] = {}
+_STORE_LOCK = threading.Lock()
+
+# Atom / decision ids only need to be unique within the process: one random
+# prefix plus a counter avoids an os.urandom call per id.
+_BATCH_PREFIX = secrets.token_hex(6)
+_COUNTER = itertools.count()
+
+def _next_id() -> str:
+    return f"{_BATCH_PREFIX}{next(_COUNTER):08x}"
+
+def _store_atom(kind: str, payload: Dict, atom_id: str = None) -> str:
     """
-    Store atom in local in-memory store and return an id.
-    Atom is enriched with a timestamp and generated id.
+    Store atom in local in-memory store and return its id.
+    Atom is stamped with a timestamp and a generated id unless one is given.
     """
-    atom_id = f"atom_{uuid.uuid4().hex[:12]}"
-    atom_copy = atom.copy()
-    atom_copy["_id"] = atom_id
-    atom_copy["_ts"] = timestamp_secs()
-    ATOM_STORE[atom_id] = atom_copy
+    atom_id = atom_id or f"atom_{_next_id()}"
+    atom = Atom(atom_id, timestamp_secs(), kind, payload)
+    with _STORE_LOCK:
+        _INDEX[atom_id] = len(_ATOMS)
+        _ATOMS.append(atom)
     log.debug(f"[METTA_CLIENT] Stored atom {atom_id}")
     return atom_id
 
@@ -37,24 +61,17 @@ def assert_investor_profile(profile: Dict) -> str:
     Assert investor profile into our atomstore.
     Returns atom_id.
     """
-    atom = {
-        "type": "Investor",
-        "profile": profile
-    }
-    atom_id = _store_atom(atom)
-    return atom_id
+    return _store_atom("Investor", profile)
 
 def assert_asset_atom(asset: Dict) -> str:
-    atom = {
-        "type": "Asset",
-        "asset": asset
-    }
-    atom_id = _store_atom(atom)
-    return atom_id
+    return _store_atom("Asset", asset)
 
-def evaluate_asset_for_investor(asset: Dict, investor_profile: Dict, record_provenance: bool = True) -> Dict:
+def evaluate_asset_for_investor(asset: Dict, investor_profile: Dict, record_provenance: bool = True,
+                                normalized_investor: Dict = None) -> Dict:
     """
     Evaluate single asset for a given investor_profile using metta_shim.
+    normalized_investor is an optional metta_shim.normalize_investor(investor_profile)
+    result, reused across a batch; the raw profile is what gets stored.
     Returns Decision dict from metta_shim.evaluate_asset.
     """
     # Store atoms for provenance traceability
@@ -63,7 +80,8 @@ def evaluate_asset_for_investor(asset: Dict, investor_profile: Dict, record_prov
 
     # Call the shim to evaluate
     try:
-        decision = metta_shim.evaluate_asset(investor_profile, asset, record_provenance=record_provenance)
+        decision = metta_shim.evaluate_asset(normalized_investor or investor_profile, asset,
+                                             record_provenance=record_provenance)
     except Exception as e:
         log.error(f"metta_shim evaluation error: {e}")
         decision = {
@@ -76,24 +94,44 @@ def evaluate_asset_for_investor(asset: Dict, investor_profile: Dict, record_prov
             "timestamp": timestamp_secs()
         }
 
+    return _link_decision(decision, inv_atom_id, asset_atom_id)
+
+def _link_decision(decision: Dict, inv_atom_id: str, asset_atom_id: str) -> Dict:
     # Enrich decision with atom references
     decision["_investor_atom"] = inv_atom_id
     decision["_asset_atom"] = asset_atom_id
-    decision["_decision_id"] = f"decision_{uuid.uuid4().hex[:10]}"
+    decision["_decision_id"] = f"decision_{_next_id()}"
     # Optionally store the decision as an atom as well
-    ATOM_STORE[decision["_decision_id"]] = decision
+    _store_atom("Decision", decision, atom_id=decision["_decision_id"])
 
     return decision
 
+# Batches of at least this many assets go through the vectorised metta_shim path
+VECTORIZE_MIN_BATCH = 5
+
 def batch_evaluate(assets: List[Dict], investor_profile: Dict, record_provenance: bool = True) -> List[Dict]:
+    normalized = metta_shim.normalize_investor(investor_profile)
+    if len(assets) >= VECTORIZE_MIN_BATCH:
+        try:
+            decisions = metta_shim.batch_evaluate_assets(normalized, assets, record_provenance=record_provenance)
+        except Exception as e:
+            log.error(f"Batch evaluation failed, falling back to per-asset evaluation: {e}")
+        else:
+            # atoms are stored only once the batch succeeded, in the same
+            # per-asset layout as evaluate_asset_for_investor
+            return [_link_decision(d, assert_investor_profile(investor_profile), assert_asset_atom(a))
+                    for d, a in zip(decisions, assets)]
     results = []
     for a in assets:
         try:
-            res = evaluate_asset_for_investor(a, investor_profile, record_provenance=record_provenance)
+            res = evaluate_asset_for_investor(a, investor_profile, record_provenance=record_provenance,
+                                              normalized_investor=normalized)
             results.append(res)
         except Exception as e:
             log.error(f"Error evaluating {a.get('symbol')}: {e}")
     return results
 
-def get_atom(atom_id: str) -> Dict:
-    return ATOM_STORE.get(atom_id)
+def get_atom(atom_id: str) -> Optional[Atom]:
+    """Return the stored Atom (use atom.to_dict() for JSON), or None."""
+    idx = _INDEX.get(atom_id)
+    return _ATOMS[idx] if idx is not None else None
@@ -3,134 +3,188 @@ metta_shim.py
 
 A minimal MeTTa-like shim for the hackathon:
 - Accepts investor profile atoms and asset atoms (dicts)
-- Runs a small set of rules (implemented as Python functions)
+- Runs a small set of rules (inlined into a single Python function)
 - Returns a Decision dict with:
     { asset, decision, score, reason_tree, confidence, provenance }
 Designed to be simple, deterministic and explainable.
+
+batch_evaluate_assets applies the same rules to many assets at once using
+pandas column masks instead of calling each rule per asset.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
 from src.utils.logger import log
 from src.utils.helpers import timestamp_secs, pretty_json
 from src.provenance.provenance import record_provenance_blob
 
-# Threshold presets for risk tolerance mapping
-RISK_THRESHOLDS = {
-    "low": {"max_volatility": 0.15, "min_return": 0.03},
-    "medium": {"max_volatility": 0.30, "min_return": 0.06},
-    "high": {"max_volatility": 0.60, "min_return": 0.12},
+# Threshold presets for risk tolerance mapping: (max_volatility, min_return)
+_THR: Dict[str, Tuple[float, float]] = {
+    "low": (0.15, 0.03),
+    "medium": (0.30, 0.06),
+    "high": (0.60, 0.12),
 }
 
-def _rule_exclude_industry(investor: Dict, asset: Dict) -> Dict:
-    """Reject if asset sector is in investor's excluded industries."""
-    excluded = investor.get("excluded_industries") or []
-    sector = asset.get("sector", "") or ""
-    if not excluded:
-        return {"outcome": None}
-    if sector.lower() in [s.strip().lower() for s in excluded]:
-        return {
-            "outcome": "reject",
-            "rule": "exclude_by_industry",
-            "evidence": {"sector": sector, "excluded": excluded},
-            "confidence": 0.95,
-            "note": f"Asset sector '{sector}' matches investor excluded industries"
-        }
-    return {"outcome": None}
+# Outcome builders shared by the per-asset and batch paths
 
-def _rule_exclude_by_carbon(investor: Dict, asset: Dict) -> Dict:
-    """Reject if carbon_emissions/carbon score > investor.max_carbon_score (if set)."""
-    max_carbon = investor.get("max_carbon_score")
-    asset_carbon = asset.get("carbon_emissions") or asset.get("carbon_score")
-    if max_carbon is None or asset_carbon is None:
-        return {"outcome": None}
-    try:
-        ac = float(asset_carbon)
-    except Exception:
-        return {"outcome": None}
-    if ac > float(max_carbon):
+def _industry_outcome(sector, excluded) -> Dict:
+    return {
+        "outcome": "reject",
+        "rule": "exclude_by_industry",
+        "evidence": {"sector": sector, "excluded": excluded},
+        "confidence": 0.95,
+        "note": f"Asset sector '{sector}' matches investor excluded industries"
+    }
+
+def _carbon_outcome(ac: float, max_carbon) -> Dict:
+    return {
+        "outcome": "reject",
+        "rule": "exclude_by_carbon",
+        "evidence": {"carbon": ac, "max_allowed": max_carbon},
+        "confidence": 0.9,
+        "note": f"Asset carbon {ac} > investor max {max_carbon}"
+    }
+
+def _large_drop_outcome(pct) -> Dict:
+    return {
+        "outcome": "deprioritize",
+        "rule": "recent_large_drop",
+        "evidence": {"percent_change": pct},
+        "confidence": 0.7,
+        "note": "Asset dropped more than 5% recently"
+    }
+
+def _return_and_risk_outcome(accepted: bool, exp_r: float, vol, thresholds: Dict) -> Dict:
+    if accepted:
         return {
-            "outcome": "reject",
-            "rule": "exclude_by_carbon",
-            "evidence": {"carbon": ac, "max_allowed": max_carbon},
-            "confidence": 0.9,
-            "note": f"Asset carbon {ac} > investor max {max_carbon}"
+            "outcome": "accept",
+            "rule": "accept_by_return_and_risk",
+            "evidence": {"expected_return": exp_r, "volatility": vol, "thresholds": thresholds},
+            "confidence": 0.8,
+            "note": "Meets expected return and volatility thresholds"
         }
-    return {"outcome": None}
+    return {
+        "outcome": "deprioritize",
+        "rule": "deprioritize_by_return_or_risk",
+        "evidence": {"expected_return": exp_r, "volatility": vol, "thresholds": thresholds},
+        "confidence": 0.6,
+        "note": "Fails return / volatility requirements"
+    }
 
-def _rule_recent_large_drop(investor: Dict, asset: Dict) -> Dict:
-    """Deprioritize if the percent change in last quote is less than -5%."""
-    pct = asset.get("percent_change")
-    if pct is None:
-        return {"outcome": None}
+def _excluded_industries(value) -> List[str]:
+    """The string entries of excluded_industries; anything malformed is dropped."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
     try:
-        if float(pct) <= -5:
-            return {
-                "outcome": "deprioritize",
-                "rule": "recent_large_drop",
-                "evidence": {"percent_change": pct},
-                "confidence": 0.7,
-                "note": "Asset dropped more than 5% recently"
-            }
-    except Exception:
-        pass
-    return {"outcome": None}
+        entries = list(value)
+    except TypeError:
+        log.error(f"Ignoring non-iterable excluded_industries: {value!r}")
+        return []
+    return [s for s in entries if isinstance(s, str)]
 
-def _rule_return_and_risk(investor: Dict, asset: Dict) -> Dict:
-    """Accept if expected_return >= threshold & volatility <= threshold (simple heuristic).
-       Use investor.goal and risk_tolerance to tune. For MVP we guess expected_return
-       from analyst estimates or use percent_change as proxy if absent.
+def normalize_investor(investor: Dict) -> Dict:
+    """
+    Build the normalised investor view the rules work on: excluded industries
+    as a lowercase set, max carbon as a float and the resolved risk thresholds
+    as plain floats. Malformed fields fall back to their defaults rather than
+    raising. Compute it once per batch; evaluate_asset normalises raw profiles itself.
     """
+    if "excluded_industries_set" in investor:
+        return investor
+    excluded = _excluded_industries(investor.get("excluded_industries"))
+    max_carbon = investor.get("max_carbon_score")
+    if max_carbon is not None:
+        try:
+            max_carbon = float(max_carbon)
+        except Exception:
+            log.error(f"Ignoring non-numeric max_carbon_score: {max_carbon!r}")
+            max_carbon = None
     risk = investor.get("risk_tolerance", "medium")
-    thresholds = RISK_THRESHOLDS.get(risk, RISK_THRESHOLDS["medium"])
-    expected_return = asset.get("expected_return")
-    volatility = asset.get("volatility") or asset.get("beta") or asset.get("stddev")
+    max_vol, min_ret = _THR.get(risk if isinstance(risk, str) else "medium", _THR["medium"])
+    return {
+        "excluded_industries": excluded,
+        "excluded_industries_set": frozenset(s.strip().lower() for s in excluded),
+        "max_carbon_score": max_carbon,
+        "max_volatility": max_vol,
+        "min_return": min_ret,
+        # reported as evidence in return/risk reason nodes
+        "thresholds": {"max_volatility": max_vol, "min_return": min_ret},
+    }
 
-    # Fallback heuristics if expected_return missing: use percent_change as proxy
-    if expected_return is None:
-        pct = asset.get("percent_change")
-        if pct is not None:
-            expected_return = max(float(pct) / 100.0, 0.0)  # naive
-    try:
-        exp_r = float(expected_return) if expected_return is not None else None
-    except Exception:
-        exp_r = None
+def _is_missing(value) -> bool:
+    # NaN counts as missing, matching how the DataFrame-based batch path sees it
+    return value is None or (isinstance(value, float) and value != value)
+
+def _as_float(value):
+    """float(value), or None where value is missing (None / NaN) or not numeric."""
+    if _is_missing(value):
+        return None
     try:
-        vol = float(volatility) if volatility is not None else None
+        f = float(value)
     except Exception:
-        vol = None
+        return None
+    return None if f != f else f
 
-    # If we can't compute, return no outcome but low confidence score
-    if exp_r is None:
-        return {"outcome": None}
+def _first(asset: Dict, *keys: str):
+    """`asset.get(a) or asset.get(b) or ...`, treating NaN as falsy."""
+    value = None
+    for key in keys:
+        value = asset.get(key)
+        if value and not _is_missing(value):
+            return value
+    return value
 
-    if exp_r >= thresholds["min_return"] and (vol is None or vol <= thresholds["max_volatility"]):
-        return {
-            "outcome": "accept",
-            "rule": "accept_by_return_and_risk",
-            "evidence": {"expected_return": exp_r, "volatility": vol, "thresholds": thresholds},
-            "confidence": 0.8,
-            "note": "Meets expected return and volatility thresholds"
-        }
+def _evaluate_inlined(investor: Dict, asset: Dict) -> Tuple[Optional[str], float, List[Dict]]:
+    """
+    Run all rules in a single pass and return (decision, confidence, reason_tree).
+    decision is None when no rule fired. The rejects run first; return_and_risk
+    precedes the cheaper drop check so an accept can short-circuit it:
+      1. exclude_by_industry   -> reject (set lookup)
+      2. exclude_by_carbon     -> reject (float conversion)
+      3. return_and_risk       -> accept / deprioritize; an accept is final since
+                                  nothing after it can reject
+      4. recent_large_drop     -> deprioritize
+    Expected return falls back to percent_change as a naive proxy when absent.
+    """
+    excluded_set = investor["excluded_industries_set"]
+    if excluded_set:
+        sector = _first(asset, "sector") or ""
+        if isinstance(sector, str) and sector.lower() in excluded_set:
+            return "reject", 0.95, [_industry_outcome(sector, investor["excluded_industries"])]
+
+    max_carbon = investor["max_carbon_score"]
+    if max_carbon is not None:
+        ac = _as_float(_first(asset, "carbon_emissions", "carbon_score"))
+        if ac is not None and ac > max_carbon:
+            return "reject", 0.9, [_carbon_outcome(ac, max_carbon)]
+
+    pct = asset.get("percent_change")
+    pct_f = _as_float(pct)
+    expected_return = asset.get("expected_return")
+    if _is_missing(expected_return):
+        exp_r = max(pct_f / 100.0, 0.0) if pct_f is not None else None  # naive
     else:
-        return {
-            "outcome": "deprioritize",
-            "rule": "deprioritize_by_return_or_risk",
-            "evidence": {"expected_return": exp_r, "volatility": vol, "thresholds": thresholds},
-            "confidence": 0.6,
-            "note": "Fails return / volatility requirements"
-        }
+        exp_r = _as_float(expected_return)
 
-# Ordered list of rule functions to execute (short-circuiting where appropriate)
-RULES = [
-    _rule_exclude_industry,
-    _rule_exclude_by_carbon,
-    _rule_recent_large_drop,
-    _rule_return_and_risk
-]
+    reason_tree = []
+    if exp_r is not None:
+        vol = _as_float(_first(asset, "volatility", "beta", "stddev"))
+        if exp_r >= investor["min_return"] and (vol is None or vol <= investor["max_volatility"]):
+            return "accept", 0.8, [_return_and_risk_outcome(True, exp_r, vol, investor["thresholds"])]
+        reason_tree.append(_return_and_risk_outcome(False, exp_r, vol, investor["thresholds"]))
+
+    if pct_f is not None and pct_f <= -5:
+        reason_tree.append(_large_drop_outcome(pct))
+
+    if not reason_tree:
+        return None, 0.0, reason_tree
+    return "deprioritize", max(node["confidence"] for node in reason_tree), reason_tree
 
 def evaluate_asset(investor: Dict, asset: Dict, record_provenance: bool = True) -> Dict:
     """
-    Evaluate a single asset for an investor.
+    Evaluate a single asset for an investor (raw or normalize_investor profile).
     Returns a Decision dict:
     {
         "asset": symbol,
@@ -141,44 +195,14 @@ def evaluate_asset(investor: Dict, asset: Dict, record_provenance: bool = True)
         "provenance": { hash/path/timestamp }
     }
     """
+    investor = normalize_investor(investor)
     symbol = asset.get("symbol") or asset.get("id") or "UNKNOWN"
-    reason_tree = []
-    final_decision = None
-    final_confidence = 0.0
-
-    # Run through rules in order; collect reason nodes
-    for rule_fn in RULES:
-        try:
-            res = rule_fn(investor, asset)
-        except Exception as e:
-            log.error(f"Rule {rule_fn.__name__} exception for {symbol}: {e}")
-            continue
-        if not res or res.get("outcome") is None:
-            continue
-        # Append reason node
-        node = {
-            "rule": res.get("rule", rule_fn.__name__),
-            "outcome": res.get("outcome"),
-            "evidence": res.get("evidence"),
-            "note": res.get("note"),
-            "confidence": float(res.get("confidence", 0.5))
-        }
-        reason_tree.append(node)
-        # Decide precedence: reject overrides accept. deprioritize is weaker than accept.
-        if node["outcome"] == "reject":
-            final_decision = "reject"
-            final_confidence = max(final_confidence, node["confidence"])
-            break  # immediate reject
-        if node["outcome"] == "accept":
-            # accept if not previously rejected
-            if final_decision != "accept":
-                final_decision = "accept"
-                final_confidence = max(final_confidence, node["confidence"])
-        if node["outcome"] == "deprioritize":
-            if final_decision not in ("accept", "reject"):
-                final_decision = "deprioritize"
-                final_confidence = max(final_confidence, node["confidence"])
+    final_decision, final_confidence, reason_tree = _evaluate_inlined(investor, asset)
+    return _finalize_decision(asset, symbol, reason_tree, final_decision, final_confidence, record_provenance)
 
+def _finalize_decision(asset: Dict, symbol: str, reason_tree: List[Dict], final_decision, final_confidence: float,
+                       record_provenance: bool) -> Dict:
+    """Apply the default outcome, score the decision and record provenance."""
     # If no rule fired, default: deprioritize with low confidence
     if final_decision is None:
         final_decision = "deprioritize"
@@ -218,3 +242,98 @@ def evaluate_asset(investor: Dict, asset: Dict, record_provenance: bool = True)
     # log.debug(pretty_json(decision))
 
     return decision
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series(None, index=df.index, dtype=object)
+
+def _coalesce(df: pd.DataFrame, *names: str) -> pd.Series:
+    """Column-wise equivalent of `asset.get(a) or asset.get(b) or ...`."""
+    out = _column(df, names[0])
+    for name in names[1:]:
+        falsy = out.isna() | out.isin([0, ""])
+        out = out.where(~falsy, _column(df, name))
+    return out
+
+def _to_float(series: pd.Series) -> pd.Series:
+    """Convert to float; values float() would reject become NaN."""
+    def conv(v):
+        try:
+            return float(v) if v is not None else float("nan")
+        except Exception:
+            return float("nan")
+    try:
+        return pd.to_numeric(series, errors="coerce").astype(float)
+    except (TypeError, ValueError):
+        return series.map(conv).astype(float)
+
+def _nan_to_none(v):
+    return None if v != v else v
+
+def batch_evaluate_assets(investor: Dict, assets: List[Dict], record_provenance: bool = True) -> List[Dict]:
+    """
+    Evaluate many assets for one investor. Produces the same Decision dicts as
+    evaluate_asset, but the rules run as boolean masks over a DataFrame of all
+    assets instead of one Python call per rule per asset.
+    """
+    if not assets:
+        return []
+    investor = normalize_investor(investor)
+    df = pd.DataFrame(assets)
+    no = pd.Series(False, index=df.index)
+
+    excluded_set = investor["excluded_industries_set"]
+    if excluded_set:
+        sector = _column(df, "sector")
+        sector = sector.where(sector.notna() & (sector != ""), "")
+        reject_industry = sector.astype(str).str.lower().isin(excluded_set)
+    else:
+        reject_industry = no
+
+    carbon = _to_float(_coalesce(df, "carbon_emissions", "carbon_score"))
+    max_carbon = investor["max_carbon_score"]
+    if max_carbon is not None:
+        reject_carbon = ~reject_industry & (carbon > max_carbon)
+    else:
+        reject_carbon = no
+    rejected = reject_industry | reject_carbon
+
+    pct = _to_float(_column(df, "percent_change"))
+    large_drop = ~rejected & (pct <= -5)
+
+    thresholds = investor["thresholds"]
+    max_vol, min_ret = investor["max_volatility"], investor["min_return"]
+    expected_raw = _column(df, "expected_return")
+    # percent_change proxy only where expected_return is missing altogether
+    exp_r = _to_float(expected_raw).where(expected_raw.notna(), (pct / 100.0).clip(lower=0.0))
+    vol = _to_float(_coalesce(df, "volatility", "beta", "stddev"))
+    has_return = ~rejected & exp_r.notna()
+    accept = has_return & (exp_r >= min_ret) & (vol.isna() | (vol <= max_vol))
+
+    rows = zip(assets, reject_industry.tolist(), reject_carbon.tolist(), large_drop.tolist(),
+               has_return.tolist(), accept.tolist(), carbon.tolist(), exp_r.tolist(), vol.tolist())
+    # Build every reason tree before recording any provenance, so a failure
+    # here leaves nothing behind for the caller's per-asset fallback to duplicate
+    outcomes = []
+    for asset, rej_ind, rej_carbon, dropped, has_ret, accepted, ac, er, v in rows:
+        symbol = asset.get("symbol") or asset.get("id") or "UNKNOWN"
+        reason_tree = []
+        final_decision = None
+        if rej_ind:
+            reason_tree.append(_industry_outcome(asset.get("sector"), investor["excluded_industries"]))
+            final_decision = "reject"
+        elif rej_carbon:
+            reason_tree.append(_carbon_outcome(ac, max_carbon))
+            final_decision = "reject"
+        else:
+            # same order and accept short-circuit as _evaluate_inlined
+            if has_ret:
+                reason_tree.append(_return_and_risk_outcome(accepted, er, _nan_to_none(v), thresholds))
+            if dropped and not accepted:
+                reason_tree.append(_large_drop_outcome(asset.get("percent_change")))
+            if reason_tree:
+                final_decision = "accept" if accepted else "deprioritize"
+        final_confidence = max((node["confidence"] for node in reason_tree), default=0.0)
+        outcomes.append((asset, symbol, reason_tree, final_decision, final_confidence))
+    return [_finalize_decision(*outcome, record_provenance) for outcome in outcomes]
@@ -0,0 +1,30 @@
+import pytest
+from src.metta import metta_client
+
+def test_batch_evaluate_links_decisions_to_atoms():
+    assets = [{"symbol": f"SYM{i}", "sector": "Technology", "expected_return": 0.1 * i} for i in range(6)]
+    investor = {"risk_tolerance": "medium", "excluded_industries": []}
+    before = len(metta_client._ATOMS)
+    decisions = metta_client.batch_evaluate(assets, investor, record_provenance=False)
+    assert [d["asset"] for d in decisions] == [a["symbol"] for a in assets]
+    # same layout as the per-asset path: investor, asset and decision atom per asset
+    assert len(metta_client._ATOMS) - before == 3 * len(assets)
+
+    decision = decisions[0]
+    atom = metta_client.get_atom(decision["_decision_id"])
+    assert atom.kind == "Decision" and atom.payload is decision
+    assert metta_client.get_atom(decision["_asset_atom"]).payload is assets[0]
+    assert metta_client.get_atom(decision["_investor_atom"]).to_dict()["payload"] == investor
+    assert metta_client.get_atom("atom_missing") is None
+
+def test_batch_failure_falls_back_without_duplicate_atoms(monkeypatch):
+    def broken_batch(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(metta_client.metta_shim, "batch_evaluate_assets", broken_batch)
+    assets = [{"symbol": f"SYM{i}", "expected_return": 0.1} for i in range(metta_client.VECTORIZE_MIN_BATCH)]
+    before = len(metta_client._ATOMS)
+    decisions = metta_client.batch_evaluate(assets, {"risk_tolerance": "low"}, record_provenance=False)
+    assert [d["decision"] for d in decisions] == ["accept"] * len(assets)
+    # per asset: one investor, one asset and one decision atom
+    assert len(metta_client._ATOMS) - before == 3 * len(assets)
@@ -0,0 +1,58 @@
+import pytest
+from src.metta import metta_shim
+
+NAN = float("nan")
+
+INVESTOR = {
+    "risk_tolerance": "medium",
+    "excluded_industries": [" Tobacco ", "Oil & Gas"],
+    "max_carbon_score": 100,
+}
+
+ASSETS = [
+    {"symbol": "SMOKE", "sector": "tobacco", "percent_change": 12.0},
+    {"symbol": "DIRTY", "sector": "Utilities", "carbon_emissions": 250, "percent_change": 10.0},
+    {"symbol": "GOOD", "sector": "Technology", "expected_return": 0.2, "volatility": 0.1},
+    {"symbol": "RISKY", "sector": "Technology", "expected_return": 0.2, "beta": 0.9},
+    {"symbol": "DROP", "sector": "Retail", "percent_change": -7.5},
+    {"symbol": "PROXY", "sector": "Retail", "percent_change": 8.0, "carbon_score": 50},
+    {"symbol": "EMPTY"},
+    {"id": "bitcoin", "percent_change": "n/a"},
+    # NaN is treated as missing by both paths
+    {"symbol": "NANRET", "sector": "Retail", "expected_return": NAN, "percent_change": 250},
+    {"symbol": "NANVOL", "sector": "Retail", "expected_return": 0.2, "volatility": NAN, "beta": 0.9},
+    {"symbol": "NANCARB", "sector": "Retail", "carbon_emissions": NAN, "carbon_score": 250},
+    {"symbol": "NANPCT", "sector": NAN, "percent_change": NAN},
+]
+
+def _strip(decision):
+    return {k: v for k, v in decision.items() if k not in ("timestamp", "provenance")}
+
+def test_batch_matches_single_asset_evaluation():
+    batch = metta_shim.batch_evaluate_assets(INVESTOR, ASSETS, record_provenance=False)
+    single = [metta_shim.evaluate_asset(INVESTOR, a, record_provenance=False) for a in ASSETS]
+    assert [_strip(d) for d in batch] == [_strip(d) for d in single]
+    assert [d["decision"] for d in batch] == [
+        "reject", "reject", "accept", "deprioritize", "deprioritize", "accept", "deprioritize", "deprioritize",
+        "accept", "deprioritize", "reject", "deprioritize",
+    ]
+
+def test_normalized_investor_matches_raw_profile():
+    normalized = metta_shim.normalize_investor(INVESTOR)
+    assert normalized["excluded_industries_set"] == {"tobacco", "oil & gas"}
+    for asset in ASSETS:
+        raw = metta_shim.evaluate_asset(INVESTOR, asset, record_provenance=False)
+        fast = metta_shim.evaluate_asset(normalized, asset, record_provenance=False)
+        assert _strip(raw) == _strip(fast)
+
+@pytest.mark.parametrize("investor", [
+    {"excluded_industries": ["Tobacco", None, 3], "risk_tolerance": ["high"]},
+    {"excluded_industries": 42, "risk_tolerance": {"level": "low"}},
+    {"excluded_industries": "Tobacco", "risk_tolerance": "extreme"},
+])
+def test_malformed_investor_falls_back_to_defaults(investor):
+    normalized = metta_shim.normalize_investor(investor)
+    assert normalized["excluded_industries_set"] <= {"tobacco"}
+    assert (normalized["max_volatility"], normalized["min_return"]) == metta_shim._THR["medium"]
+    batch = metta_shim.batch_evaluate_assets(normalized, ASSETS, record_provenance=False)
+    assert len(batch) == len(ASSETS)
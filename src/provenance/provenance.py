@@ -1,36 +1,125 @@
 import os
 import json
 import time
-from src.utils.helpers import sha256_of_obj, pretty_json
+import uuid
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.helpers import hash_of_obj, json_bytes, json_loads, HASH_ALGO
 from src.utils.config import PROVENANCE_DIR
 from src.utils.logger import log
 
 os.makedirs(PROVENANCE_DIR, exist_ok=True)
 
+# Provenance entries are appended, one JSON object per line, to a daily (UTC)
+# log file PROVENANCE_DIR/YYYY-MM-DD.jsonl. A single background writer owns
+# the open handle, which keeps appends ordered and off the evaluation path.
+# Writes stay buffered and are fsynced once the queue drains rather than per
+# line, so a burst of decisions costs one sync instead of one per entry.
+_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="provenance")
+_handle = None
+_handle_path = None
+_pending = 0
+_pending_lock = threading.Lock()
+
+def _log_path(ts: int) -> str:
+    return os.path.join(PROVENANCE_DIR, time.strftime("%Y-%m-%d", time.gmtime(ts)) + ".jsonl")
+
+def _sync():
+    """Flush and fsync the open log; runs on the writer thread."""
+    if _handle is not None:
+        try:
+            _handle.flush()
+            os.fsync(_handle.fileno())
+        except Exception as e:
+            log.error(f"Failed to sync provenance log {_handle_path}: {e}")
+
+def _append_entry(entry: dict, path: str):
+    global _handle, _handle_path, _pending
+    try:
+        if path != _handle_path:
+            # first write or date rollover
+            _close_handle()
+            _handle = open(path, "ab")
+            _handle_path = path
+        _handle.write(json_bytes(entry) + b"\n")
+        log.info(f"[PROVENANCE] Wrote provenance for {entry['symbol']} -> {entry['hash']}")
+    except Exception as e:
+        log.error(f"Failed to append provenance entry to {path}: {e}")
+    finally:
+        with _pending_lock:
+            _pending -= 1
+            drained = _pending == 0
+        if drained:
+            _sync()
+
+def _close_handle():
+    global _handle, _handle_path
+    if _handle is not None:
+        _sync()
+        _handle.close()
+    _handle, _handle_path = None, None
+
+def _shutdown():
+    _WRITER.shutdown(wait=True)
+    _close_handle()
+
+atexit.register(_shutdown)
+
+def wait_for_writes():
+    """Block until every entry recorded so far has been written and synced."""
+    _WRITER.submit(_sync).result()
+
 def record_provenance_blob(raw_api_response: dict, tag: str = None) -> dict:
     """
-    Save a provenance JSON containing:
+    Append a provenance entry to the daily JSONL log containing:
       - original API response (raw_api_response)
-      - a SHA256 hash of the sorted JSON
-      - timestamp, source and optional tag
-    Returns the provenance entry dict.
+      - a hash of the sorted JSON (BLAKE3, or SHA256 without blake3 installed)
+      - an entry id, timestamp, source and optional tag
+    The hash is computed immediately; the line itself is written in the
+    background. Returns the id / hash / log path of the entry.
     """
+    global _pending
     ts = int(time.time())
-    hash_ = sha256_of_obj(raw_api_response)
+    hash_ = hash_of_obj(raw_api_response)
     entry = {
+        "id": uuid.uuid4().hex,
         "timestamp": ts,
         "source": raw_api_response.get("source", "unknown"),
         "symbol": raw_api_response.get("symbol") or raw_api_response.get("id"),
         "hash": hash_,
-        "raw": raw_api_response,
+        "hash_algo": HASH_ALGO,
+        # shallow copy: the write happens later, after the caller moves on
+        "raw": dict(raw_api_response),
         "tag": tag
     }
-    filename = f"{entry['symbol']}_{ts}.json"
-    path = os.path.join(PROVENANCE_DIR, filename)
-    try:
-        with open(path, "w") as f:
-            f.write(pretty_json(entry))
-        log.info(f"[PROVENANCE] Wrote provenance for {entry['symbol']} -> {hash_}")
-    except Exception as e:
-        log.error(f"Failed to write provenance file {path}: {e}")
-    return {"symbol": entry["symbol"], "hash": hash_, "path": path, "timestamp": ts}
+    path = _log_path(ts)
+    with _pending_lock:
+        _pending += 1
+    _WRITER.submit(_append_entry, entry, path)
+    return {"id": entry["id"], "symbol": entry["symbol"], "hash": hash_, "hash_algo": HASH_ALGO,
+            "path": path, "timestamp": ts}
+
+def find_provenance(entry_id: str, path: str = None) -> dict:
+    """
+    Look up a full provenance entry by id by scanning the JSONL log at path
+    (as returned by record_provenance_blob), or every daily log if omitted.
+    Returns None if not found.
+    """
+    wait_for_writes()
+    if path:
+        paths = [path]
+    else:
+        paths = sorted(os.path.join(PROVENANCE_DIR, f) for f in os.listdir(PROVENANCE_DIR) if f.endswith(".jsonl"))
+    needle = f'"id":"{entry_id}"'.encode("utf-8")
+    for p in paths:
+        try:
+            with open(p, "rb") as f:
+                for line in f:
+                    if needle in line:
+                        entry = json_loads(line)
+                        if entry.get("id") == entry_id:
+                            return entry
+        except FileNotFoundError:
+            continue
+    return None
@@ -0,0 +1,58 @@
+import threading
+import time
+import types
+import pytest
+from src.provenance import provenance
+
+DAY1 = 1767268800  # 2026-01-01T12:00:00Z
+DAY2 = DAY1 + 24 * 3600
+
+@pytest.fixture
+def clock(monkeypatch, tmp_path):
+    monkeypatch.setattr(provenance, "PROVENANCE_DIR", str(tmp_path))
+    now = {"ts": DAY1}
+    fake_time = types.SimpleNamespace(time=lambda: now["ts"], strftime=time.strftime, gmtime=time.gmtime)
+    monkeypatch.setattr(provenance, "time", fake_time)
+    yield now
+    provenance.wait_for_writes()
+    provenance._WRITER.submit(provenance._close_handle).result()
+
+def test_entries_are_appended_and_found_by_id(clock, tmp_path):
+    first = provenance.record_provenance_blob({"symbol": "AAPL", "source": "finnhub"}, tag="metta_input")
+    second = provenance.record_provenance_blob({"id": "bitcoin", "source": "coingecko"})
+    assert first["path"] == second["path"] == str(tmp_path / "2026-01-01.jsonl")
+
+    for rec in (first, second):
+        for path in (rec["path"], None):
+            entry = provenance.find_provenance(rec["id"], path)
+            assert entry["hash"] == rec["hash"]
+            assert entry["symbol"] == rec["symbol"]
+    assert provenance.find_provenance(first["id"])["raw"] == {"symbol": "AAPL", "source": "finnhub"}
+    assert provenance.find_provenance("missing") is None
+    assert len((tmp_path / "2026-01-01.jsonl").read_bytes().splitlines()) == 2
+
+def test_handle_is_reopened_on_date_rollover(clock, tmp_path):
+    first = provenance.record_provenance_blob({"symbol": "AAPL"})
+    provenance.wait_for_writes()
+    old_handle = provenance._handle
+
+    clock["ts"] = DAY2
+    second = provenance.record_provenance_blob({"symbol": "MSFT"})
+    provenance.wait_for_writes()
+    assert second["path"] == str(tmp_path / "2026-01-02.jsonl")
+    assert provenance._handle_path == second["path"]
+    assert old_handle.closed and not provenance._handle.closed
+    assert provenance.find_provenance(first["id"], first["path"])["symbol"] == "AAPL"
+    assert provenance.find_provenance(second["id"])["symbol"] == "MSFT"
+
+def test_queued_entries_share_one_fsync(clock, tmp_path, monkeypatch):
+    syncs = []
+    monkeypatch.setattr(provenance.os, "fsync", syncs.append)
+    gate = threading.Event()
+    provenance._WRITER.submit(gate.wait)
+    records = [provenance.record_provenance_blob({"symbol": f"SYM{i}"}) for i in range(10)]
+    gate.set()
+    provenance.wait_for_writes()
+    # one sync when the queue drained, one more from wait_for_writes
+    assert len(syncs) == 2
+    assert len((tmp_path / "2026-01-01.jsonl").read_bytes().splitlines()) == len(records)
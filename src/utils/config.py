@@ -8,5 +8,7 @@ AGENT_PRIVATE_KEY = os.getenv("AGENT_PRIVATE_KEY")
 AGENT_HOST = os.getenv("AGENT_HOST", "0.0.0.0")
 AGENT_PORT = int(os.getenv("AGENT_PORT", 8000))
 PROVENANCE_DIR = os.getenv("PROVENANCE_DIR", "./provenance_logs")
+CACHE_DIR = os.getenv("CACHE_DIR", "./.cache")
+MAX_FETCH_WORKERS = int(os.getenv("MAX_FETCH_WORKERS", 16))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 IPFS_API_URL = os.getenv("IPFS_API_URL", None)
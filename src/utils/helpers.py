@@ -1,12 +1,34 @@
 import hashlib
 import json
 import time
+import orjson
 from .logger import log
 
-def sha256_of_obj(obj) -> str:
-    """Return hex sha256 of JSON-serialised object (stable sort)."""
-    raw = json.dumps(obj, sort_keys=True, default=str)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+try:
+    import blake3
+except ImportError:  # optional: fall back to hashlib
+    blake3 = None
+
+HASH_ALGO = "blake3" if blake3 is not None else "sha256"
+
+_JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def json_bytes(obj) -> bytes:
+    """Serialise obj to compact UTF-8 JSON bytes with sorted keys. orjson is
+    required (not optional): these bytes feed provenance hashes, so the encoding
+    of NaN, datetimes and non-str keys must not depend on what is installed."""
+    return orjson.dumps(obj, option=_JSON_OPTIONS, default=str)
+
+def json_loads(data):
+    """Parse JSON from bytes or str."""
+    return orjson.loads(data)
+
+def hash_of_obj(obj) -> str:
+    """Return hex digest (HASH_ALGO) of JSON-serialised object (stable sort)."""
+    raw = json_bytes(obj)
+    if blake3 is not None:
+        return blake3.blake3(raw).hexdigest()
+    return hashlib.sha256(raw).hexdigest()
 
 def timestamp_secs():
     return int(time.time())
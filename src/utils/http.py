@@ -0,0 +1,50 @@
+"""
+Shared HTTP session setup for the market data sources: pooled keep-alive
+connections and bounded retries with exponential backoff on transient
+errors (429 / 5xx), honouring Retry-After up to MAX_BACKOFF_SECS so a large
+header value can't stall a worker thread.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 4
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF_SECS = 30
+
+class _CappedRetry(Retry):
+    """urllib3 Retry whose Retry-After wait is capped at MAX_BACKOFF_SECS."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_BACKOFF_SECS)
+
+def make_retry() -> Retry:
+    return _CappedRetry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+    )
+
+def make_session(pool_size: int = 32) -> requests.Session:
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=make_retry(),
+    ))
+    return session
+
+def backoff_delay(attempt: int, retry_after: str = None) -> float:
+    """Seconds to wait before retry number attempt (0-based), for async clients
+    that can't use urllib3's Retry. A numeric Retry-After header wins; both
+    are capped at MAX_BACKOFF_SECS, like make_retry()."""
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_BACKOFF_SECS)
+        except ValueError:
+            pass
+    return min(BACKOFF_FACTOR * (2 ** attempt), MAX_BACKOFF_SECS)